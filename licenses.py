@@ -1,49 +1,56 @@
-LICENSES = {
+import sys
+from types import MappingProxyType
+
+LICENSE_FIXES = {
+    'cal': {
+        'prefix': ('https://raw.githubusercontent.com/github/'
+                   'choosealicense.com/gh-pages/_licenses/'),
+        'suffix': '.txt'
+    }
+}
+DEFAULT_CLASSIFIER = 'License :: Other/Proprietary License'
+OSI_APPROVED = 'License :: OSI Approved :: '
+_LICENSES = {
     'afl-3.0': {
         'title': 'Academic Free License v3.0',
         'abbr': 'AFL',
-        'classifier': 'License :: OSI Approved :: Academic Free License (AFL)',
+        'classifier': OSI_APPROVED + 'Academic Free License (AFL)',
         'src': '::cal'
     },
     'agpl-3.0': {
         'title': 'GNU Affero General Public License v3.0',
-        'classifier': 'License :: OSI Approved :: GNU Affero General Public '
+        'classifier': OSI_APPROVED + 'GNU Affero General Public '
                       'License v3',
         'src': '::cal'
     },
     'apache-2.0': {
         'title': 'Apache License 2.0',
-        'classifier': 'License :: OSI Approved :: Apache Software License',
+        'classifier': OSI_APPROVED + 'Apache Software License',
         'src': '::cal'
     },
     'artistic-2.0': {
         'title': 'Artistic License 2.0',
-        'classifier': 'License :: OSI Approved :: Artistic License',
+        'classifier': OSI_APPROVED + 'Artistic License',
         'src': '::cal'
     },
     'bsd-2-clause': {
         'title': 'BSD 2-clause "Simplified" License',
-        'classifier': 'License :: OSI Approved :: BSD License',
-        'src': '::cal'
-    },
-    'bsd-2-clause': {
-        'title': 'BSD 2-clause "Simplified" License',
-        'classifier': 'License :: OSI Approved :: BSD License',
+        'classifier': OSI_APPROVED + 'BSD License',
         'src': '::cal'
     },
     'bsd-3-clause-clear': {
         'title': 'BSD 3-clause Clear License',
-        'classifier': 'License :: OSI Approved :: BSD License',
+        'classifier': OSI_APPROVED + 'BSD License',
         'src': '::cal'
     },
     'bsd-3-clause': {
         'title': 'BSD 3-clause "New" or "Revised" License',
-        'classifier': 'License :: OSI Approved :: BSD License',
+        'classifier': OSI_APPROVED + 'BSD License',
         'src': '::cal'
     },
     'eupl-1.1': {
         'title': 'European Union Public License 1.1',
-        'classifier': 'License :: OSI Approved :: European Union Public '
+        'classifier': OSI_APPROVED + 'European Union Public '
                       'Licence 1.1 (EUPL 1.1)',
         'src': '::cal'
     },
@@ -55,47 +62,47 @@ LICENSES = {
     },
     'gfdl-1.3': {
         'title': 'GNU Free Documentation License 1.3',
-        'classifier': 'License :: OSI Approved :: GNU Free Documentation '
+        'classifier': OSI_APPROVED + 'GNU Free Documentation '
                       'License (FDL)',
         'src': 'https://www.gnu.org/licenses/fdl.txt'
     },
     'gpl-2.0': {
         'title': 'GNU General Public License, version 2',
-        'classifier': 'License :: OSI Approved :: GNU General Public License '
+        'classifier': OSI_APPROVED + 'GNU General Public License '
                       'v2 (GPLv2)',
         'src': 'https://www.gnu.org/licenses/gpl-2.0.txt'
     },
     'gpl-3.0': {
         'title': 'GNU General Public License, version 3',
-        'classifier': 'License :: OSI Approved :: GNU General Public License '
+        'classifier': OSI_APPROVED + 'GNU General Public License '
                       'v3 (GPLv3)',
         'src': 'https://www.gnu.org/licenses/gpl-3.0.txt'
     },
     'lgpl-2.1': {
         'title': 'GNU Lesser General Public License v2.1',
-        'classifier': 'License :: OSI Approved :: GNU Lesser General Public '
+        'classifier': OSI_APPROVED + 'GNU Lesser General Public '
                       'License v2 (LGPLv2)',
         'src': 'https://www.gnu.org/licenses/lgpl-2.1.txt'
     },
     'lgpl-3.0': {
         'title': 'GNU Lesser General Public License v3.0',
-        'classifier': 'License :: OSI Approved :: GNU Lesser General Public '
+        'classifier': OSI_APPROVED + 'GNU Lesser General Public '
                       'License v3 (LGPLv3)',
         'src': 'https://www.gnu.org/licenses/lgpl-3.0.txt'
     },
     'isc': {
         'title': 'ISC License',
-        'classifier': 'License :: OSI Approved :: ISC License (ISCL)',
+        'classifier': OSI_APPROVED + 'ISC License (ISCL)',
         'src': '::cal'
     },
     'mit': {
         'title': 'MIT License',
-        'classifier': 'License :: OSI Approved :: MIT License',
+        'classifier': OSI_APPROVED + 'MIT License',
         'src': '::cal'
     },
     'mpl-2.0': {
         'title': 'Mozilla Public License 2.0',
-        'classifier': 'License :: OSI Approved :: Mozilla Public License 2.0 '
+        'classifier': OSI_APPROVED + 'Mozilla Public License 2.0 '
                       '(MPL 2.0)',
         'src': '::cal'
     },
@@ -152,3 +159,23 @@ LICENSES = {
         'src': '::cal'
     }
 }
+
+
+def _license_url(slug, src):
+    """
+    resolve a license "src" value (a url or a "::" fix reference) to a url
+    """
+    if src is None or src[0:2] != '::':
+        return src
+    fix = LICENSE_FIXES[src[2:]]
+    return fix['prefix'] + slug + fix['suffix']
+
+
+# read-only views and derived lookup tables, computed once at import time
+LICENSES = MappingProxyType({
+    sys.intern(k): MappingProxyType(v) for k, v in _LICENSES.items()})
+LICENSE_URLS = MappingProxyType({
+    k: _license_url(k, v.get('src')) for k, v in LICENSES.items()})
+LICENSE_CLASSIFIERS = MappingProxyType({
+    k: sys.intern(v.get('classifier', DEFAULT_CLASSIFIER))
+    for k, v in LICENSES.items()})
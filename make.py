@@ -3,63 +3,101 @@ Make a project directory with associated setup
 """
 
 import argparse
-from copy import deepcopy
-import errno
-import frontmatter
-from functools import wraps
-import inspect
-from licenses import LICENSES
+from collections import deque
+from functools import lru_cache, wraps
+import json
+from licenses import (DEFAULT_CLASSIFIER, LICENSES, LICENSE_CLASSIFIERS,
+                      LICENSE_URLS)
 import logging
 import os
-from pprint import pformat
 import re
-import requests
 import shutil
 from string import Formatter
-import subprocess
 import sys
+import time
 import traceback
+from types import MappingProxyType
 
 
 DEFAULT_LOG_LEVEL = logging.INFO
-POSITIONAL_ARGUMENTS = sorted([
-    ['-l', '--loglevel', logging.getLevelName(DEFAULT_LOG_LEVEL),
-        'desired logging level (' +
-        'case-insensitive string: DEBUG, INFO, WARNING, or ERROR'],
-    ['-v', '--verbose', False, 'verbose output (logging level == INFO)'],
-    ['-w', '--veryverbose', False,
-        'very verbose output (logging level == DEBUG)'],
-    ['-c', '--create', False, 'create directory at indicated path'],
-    ['-p', '--pyvenv', False, 'create a python virtual environment'],
-    ['-n', '--pyversion', '3', 'version of python to use in virtual '
-                               'environment'],
-    ['-g', '--git', False, 'create a new git repository'],
-    ['-s', '--script', False, 'set up with a python script'],
-    ['-k', '--package', False, 'set up as a python package'],
-    ['-r', '--readme', False, 'add a readme file template'],
-    ['-q', '--quiet', False, 'suppress output (logging level == CRITICAL)'],
-    ['-x', '--license', 'agpl-3.0', 'license to use ("none" is an option)'],
-    ['-kv', '--pkgversion', '0.1', 'PEP440 version number to use in setup.py'],
-    ['-kd', '--pkgdescription', 'change me', 'description to use in setup.py'],
-    ['-kh', '--pkghomepage', 'http://change.me', 'home page to use in '
-                                                 'setup.py'],
-    ['-ka', '--pkgauthor', 'Change Me', 'user name to use in setup.py'],
-    ['-ke', '--pkgemail', 'change@me.org', 'email address to use in setup.py'],
-    ['-cs', '--classdevstatus', '1 - Planning', 'development status '
+LOG_LEVELS = {
+    name: getattr(logging, name)
+    for name in ('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL')
+}
+POSITIONAL_ARGUMENTS = (
+    ('-b', '--batch', None, 'JSON file listing projects to create, each an '
+                            'object of option values keyed by long option '
+                            'name and including "where"'),
+    ('-c', '--create', False, 'create directory at indicated path'),
+    ('-ca', '--classaudience', 'Developers', 'intended audience classifier '
+                                             'to use in setup.py'),
+    ('-cs', '--classdevstatus', '1 - Planning', 'development status '
                                                 'classifier to use in '
-                                                'setup.py'],
-    ['-ca', '--classaudience', 'Developers', 'intended audience classifier '
-                                             'to use in setup.py'],
-    ['-ct', '--classtopic', 'Change Me', 'topic classifier to use in '
-                                         'setup.py'],
-    ['-kk', '--pkgkeywords', '"change me", "please change me', 'keywords to '
+                                                'setup.py'),
+    ('-ct', '--classtopic', 'Change Me', 'topic classifier to use in '
+                                         'setup.py'),
+    ('-g', '--git', False, 'create a new git repository'),
+    ('-k', '--package', False, 'set up as a python package'),
+    ('-ka', '--pkgauthor', 'Change Me', 'user name to use in setup.py'),
+    ('-kd', '--pkgdescription', 'change me', 'description to use in setup.py'),
+    ('-ke', '--pkgemail', 'change@me.org', 'email address to use in setup.py'),
+    ('-kh', '--pkghomepage', 'http://change.me', 'home page to use in '
+                                                 'setup.py'),
+    ('-kk', '--pkgkeywords', '"change me", "please change me', 'keywords to '
                                                                'use in '
-                                                               'setup.py']
-])
+                                                               'setup.py'),
+    ('-kv', '--pkgversion', '0.1', 'PEP440 version number to use in setup.py'),
+    ('-l', '--loglevel', logging.getLevelName(DEFAULT_LOG_LEVEL),
+        'desired logging level (' +
+        'case-insensitive string: DEBUG, INFO, WARNING, or ERROR'),
+    ('-n', '--pyversion', '3', 'version of python to use in virtual '
+                               'environment'),
+    ('-nc', '--nocache', False, 'download fetched files (like license text) '
+                                'even if a cached copy is fresh'),
+    ('-p', '--pyvenv', False, 'create a python virtual environment'),
+    ('-q', '--quiet', False, 'suppress output (logging level == CRITICAL)'),
+    ('-r', '--readme', False, 'add a readme file template'),
+    ('-s', '--script', False, 'set up with a python script'),
+    ('-v', '--verbose', False, 'verbose output (logging level == INFO)'),
+    ('-w', '--veryverbose', False,
+        'very verbose output (logging level == DEBUG)'),
+    ('-x', '--license', 'agpl-3.0', 'license to use ("none" is an option)'),
+)
+
+
+def _argument_spec(p):
+    """
+    turn a POSITIONAL_ARGUMENTS row into (short, long, add_argument kwargs)
+    """
+    d = {
+        'help': p[3]
+    }
+    if isinstance(p[2], bool):
+        if p[2] is False:
+            d['action'] = 'store_true'
+            d['default'] = False
+        else:
+            d['action'] = 'store_false'
+            d['default'] = True
+    else:
+        d['default'] = p[2]
+    return (p[0], p[1], d)
+
+
+ARGUMENT_SPECS = tuple(_argument_spec(p) for p in POSITIONAL_ARGUMENTS)
+# options a --batch entry may set, with the type each value must have; the
+# batch and logging options apply to the whole run, not to one project
+BATCH_OPTIONS = MappingProxyType(dict(
+    [(p[1][2:], bool if isinstance(p[2], bool) else str)
+     for p in POSITIONAL_ARGUMENTS
+     if p[1][2:] not in ('batch', 'loglevel', 'quiet', 'verbose',
+                         'veryverbose')],
+    where=str))
+# TEMPLATES paths are absolute and fully resolved, so use them as-is
 template_dir = os.path.join(os.path.dirname(os.path.realpath(__file__)),
                             'templates')
 GITIGNORE_FILE = os.path.join(template_dir, 'gitignore.txt')
-TEMPLATES = {
+TEMPLATES = MappingProxyType({
     'script-2': os.path.join(template_dir, 'script_template_2.py'),
     'script-3': os.path.join(template_dir, 'script_template_3.py'),
     'package-3': os.path.join(template_dir, 'package_template_3.py'),
@@ -69,18 +107,29 @@ TEMPLATES = {
     'setup_config': os.path.join(template_dir, 'setup.cfg'),
     'manifest': os.path.join(template_dir, 'MANIFEST.in'),
     'test_template3': os.path.join(template_dir, 'test_template3.py')
-}
-TEMPLATE_RENAMES = {
+})
+TEMPLATE_RENAMES = MappingProxyType({
     'setup_template.py': 'setup.py'
-}
+})
 PACKAGE_SUBDIRECTORIES = ['scripts', 'tests', 'data']
-LICENSE_FIXES = {
-    'cal': {
-        'prefix': ('https://raw.githubusercontent.com/github/'
-                   'choosealicense.com/gh-pages/_licenses/'),
-        'suffix': '.txt'
-    }
-}
+_FICLONE = 0x40049409  # linux ioctl, for pythons whose fcntl lacks it
+_FORMATTER = Formatter()
+_WS_TABLE = str.maketrans('', '', ' \t\n\r\f\v')
+_JSON_TYPES = {bool: 'boolean', str: 'string'}
+LOGGERS = {}
+CACHE_DIR = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or
+    os.path.join(os.path.expanduser('~'), '.cache'),
+    'make-project')
+CACHE_TTL = 24 * 60 * 60  # seconds before a cached fetch is revalidated
+CACHE_404_TTL = 5 * 60  # seconds a 404 is remembered before asking again
+FETCH_WORKERS = 8
+TEMPLATE_WORKERS = 6
+FETCH_BUFFERED_MAX = 1 << 20  # bodies smaller than this are written at once
+FETCH_CHUNK_SIZE = 1 << 16
+FRONT_MATTER_MAX = 1 << 16  # give up looking for a closing fence past this
+_FRONT_MATTER_END = re.compile(rb'\r?\n---\r?\n')
+FETCH_TIMEOUT = (5, 30)  # (connect, read) seconds
 DEFAULT_DEPENDENCIES = [
     'airtight',
     'better_exceptions',
@@ -92,40 +141,116 @@ DEFAULT_DEPENDENCIES = [
 def arglogger(func):
     """
     decorator to log argument calls to functions
+
+    The function's logger is looked up once, here, and registered in
+    LOGGERS under the function's name for use in the function body.
     """
+    logger = LOGGERS.setdefault(func.__name__,
+                                logging.getLogger(func.__name__))
+
     @wraps(func)
     def inner(*args, **kwargs):
-        logger = logging.getLogger(func.__name__)
-        logger.debug("called with arguments: %s, %s" % (args, kwargs))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("called with arguments: %s, %s", args, kwargs)
         return func(*args, **kwargs)
+    inner.arglogged = True
     return inner
 
 
+def unwrap_argloggers(namespace):
+    """
+    replace arglogger wrappers in namespace with the functions they wrap
+
+    Call once logging is configured above DEBUG, when the wrappers can only
+    add overhead; the functions keep using their LOGGERS entries.
+    """
+    for name, value in list(namespace.items()):
+        if getattr(value, 'arglogged', False):
+            namespace[name] = value.__wrapped__
+
+
 @arglogger
 def main(args):
     """
     main function
+
+    The lookup tables used here are read-only and every file written is
+    keyed by where, so concurrent callers are safe as long as each passes
+    a distinct project path (this includes git commits: see GitBatcher).
+    The exception is pyvenv: environments are named by the project
+    directory's basename, so /a/foo and /b/foo both claim ~/Envs/foo and
+    must not be created concurrently.
     """
-    logger = logging.getLogger(sys._getframe().f_code.co_name)
+    from concurrent.futures import ThreadPoolExecutor
+    logger = LOGGERS['main']
 
     where = os.path.abspath(args.where)
     # global variables
     if args.script and args.package:
         raise ValueError('cannot create both a script and a package')
+    if args.pyvenv:
+        # check up front, so a clash stops us before anything is written
+        python, env_dir = check_venv(where, args.pyversion)
     if args.create:
         create_directory(where)
-    if args.pyvenv:
-        create_venv(where, args.pyversion)
-    if args.git:
-        create_git(where)
-    if args.readme:
-        create_readme(where, args.git)
-    if args.script:
-        init_script(where, args.pyversion, args.git)
-    if args.license.lower() != 'none':
-        create_license(where, args.license, args.git)
-    if args.package:
-        init_package(where, args)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        # the virtual environment lives outside the project directory and
+        # nothing below depends on it, so build it while the rest proceeds
+        if args.pyvenv:
+            venv = executor.submit(create_venv, python, env_dir)
+        if args.git:
+            create_git(where)
+        if args.readme:
+            create_readme(where, args.git)
+        if args.script:
+            init_script(where, args.pyversion, args.git)
+        if args.license.lower() != 'none':
+            create_license(where, args.license, args.git,
+                           cache=not args.nocache)
+        if args.package:
+            init_package(where, args)
+        if args.git:
+            BATCHER.flush(where, 'scaffold project')
+        if args.pyvenv:
+            venv.result()
+
+
+@arglogger
+def batch(args):
+    """
+    run main for each project listed in the JSON file named by args.batch
+    """
+    logger = LOGGERS['batch']
+    with open(args.batch, 'r') as f:
+        projects = json.load(f)
+    if not isinstance(projects, list):
+        raise ValueError('batch file {0} must hold a JSON list of projects, '
+                         'not {1}'.format(args.batch,
+                                          type(projects).__name__))
+    defaults = vars(args)
+    # check every entry before creating anything
+    for i, project in enumerate(projects):
+        if not isinstance(project, dict):
+            raise ValueError('batch entry {0} must be a JSON object, not {1}'
+                             ''.format(i, type(project).__name__))
+        unknown = sorted(set(project) - set(BATCH_OPTIONS))
+        if len(unknown) > 0:
+            raise ValueError('batch entry {0} has unknown or run-wide '
+                             'option(s): {1}'.format(i, ', '.join(unknown)))
+        if project.get('where') is None:
+            raise ValueError('batch entry {0} has no "where"'.format(i))
+        for k, v in sorted(project.items()):
+            if not isinstance(v, BATCH_OPTIONS[k]):
+                raise ValueError('batch entry {0} option "{1}" must be a '
+                                 'JSON {2}, not {3}'.format(
+                                     i, k, _JSON_TYPES[BATCH_OPTIONS[k]],
+                                     json.dumps(v)))
+    for i, project in enumerate(projects):
+        spec = dict(defaults, **project)
+        spec['batch'] = None
+        logger.info('creating project {0} of {1} at {2}'.format(
+            i + 1, len(projects), spec['where']))
+        main(argparse.Namespace(**spec))
 
 
 @arglogger
@@ -133,51 +258,43 @@ def create_directory(where):
     """
     create the project directory at the indicated path
     """
-    logger = logging.getLogger(sys._getframe().f_code.co_name)
-    try:
-        os.makedirs(where)
-    except OSError as e:
-        if e.errno == errno.EEXIST and os.path.isdir(where):
-            logger.critical(
-                'script run with directory creation, but {0} already exists'
-                ''.format(where))
-            sys.exit(1)
+    logger = LOGGERS['create_directory']
+    os.makedirs(where, exist_ok=True)
+    with os.scandir(where) as entries:
+        occupied = next(entries, None) is not None
+    if occupied:
+        logger.critical(
+            'script run with directory creation, but {0} already exists '
+            'and is not empty'.format(where))
+        sys.exit(1)
     logger.info('created new project directory at {0}'.format(where))
 
 
 @arglogger
-def create_license(where, license, git=False):
+def create_license(where, license, git=False, cache=True):
     """
     add preferred LICENSE file
     """
-    logger = logging.getLogger(sys._getframe().f_code.co_name)
+    logger = LOGGERS['create_license']
     fn = 'LICENSE.txt'
-    ld = LICENSES[license]
     try:
-        src = ld['src']
+        url = LICENSE_URLS[license]
     except KeyError:
+        url = None
+    if url is None:
         logger.warning('License data not found for "{0}". License creation '
-                           'skipped.'.format(license))
+                       'skipped.'.format(license))
     else:
-        logger.debug('src: "{0}"'.format(src))
-        logger.debug('src[0:2]: "{0}"'.format(src[0:2]))
-        if src[0:2] == '::':
-            logger.debug('src[2:]: "{0}"'.format(src[2:]))
-            src = src[2:]
-            url = (LICENSE_FIXES[src]['prefix'] + license +
-                   LICENSE_FIXES[src]['suffix'])
-        else:
-            url = src
+        title = LICENSES[license]['title']
         targets = [(url, os.path.join(where, fn))]
-        fetch(targets, strip_yaml=True)
+        fetch(targets, strip_yaml=True, cache=cache)
         if git:
-            title = ld['title']
-            git_it(where, fn, 'assigned the {0} using text from: {1}'
-                   ''.format(title, url))
-            logger.info('instantiated and committed {0} using {1} from '
-                        '{2}'.format(fn, title, url))
+            BATCHER.add(where, fn, 'assigned the {0} using text from: {1}'
+                        ''.format(title, url))
+            logger.info('instantiated {0} using {1} from {2} and queued it '
+                        'for commit'.format(fn, title, url))
         else:
-            logger.info('instantiated {0} using {0} from {1}'.format(fn, title,
+            logger.info('instantiated {0} using {1} from {2}'.format(fn, title,
                                                                      url))
 
 
@@ -186,48 +303,63 @@ def create_readme(where, git=False):
     """
     create an initial readme file
     """
-    logger = logging.getLogger(sys._getframe().f_code.co_name)
+    logger = LOGGERS['create_readme']
     src = TEMPLATES['readme']
-    src = os.path.expanduser(src)
-    src = os.path.abspath(src)
     dest_fn = os.path.basename(src)
     dest = os.path.join(where, dest_fn)
-    shutil.copy2(src, dest)
+    _copy_template(src, dest)
     logger.debug('copied {0} to {1}'.format(src, dest))
     if git:
-        git_it(os.path.dirname(dest), dest_fn,
-               'include default readme template')
-        logger.info('instantiated {0} and committed it'.format(dest_fn))
+        BATCHER.add(where, dest_fn, 'include default readme template')
+        logger.info('instantiated {0} and queued it for commit'
+                    ''.format(dest_fn))
     else:
         logger.info('instantiated {0}'.format(dest_fn))
 
 
 @arglogger
-def create_venv(where, python_version):
+def check_venv(where, python_version):
     """
-    set up python virtual environment
+    make sure a virtual environment can be set up for where
+
+    Returns the python interpreter to build it with and the environment
+    directory to build it in.
     """
-    logger = logging.getLogger(sys._getframe().f_code.co_name)
+    logger = LOGGERS['check_venv']
     v = '/usr/local/bin/python{0}'.format(python_version)
     venv_name = os.path.basename(where)
-    env_dir = '~/Envs/{0}'.format(venv_name)
-    if os.path.exists(env_dir):
+    env_dir = os.path.join(os.path.expanduser('~'), 'Envs', venv_name)
+    if os.path.lexists(env_dir):
         logger.critical(
             'script run with venv creation, but {0} already exists'
             ''.format(env_dir))
         sys.exit(1)
-    # somewhy following returns failure code 1 even when successful,
-    # so can't try
-    cmd = 'mkvirtualenv -v -p {0} {1} && deactivate'.format(v, env_dir)
-    run(cmd, check=False)  # mkvirtualenv returns non-zero code despite success
-    logger.info('instantiated python {0} virtual environment at {1}'
-                ''.format(python_version, env_dir))
-    run('workon {} && pip install -U pip  && deactivate'.format(venv_name))
+    if not os.access(v, os.X_OK):
+        logger.critical(
+            'script run with venv creation, but {0} is not an executable '
+            'python'.format(v))
+        sys.exit(1)
+    return (v, env_dir)
+
+
+@arglogger
+def create_venv(v, env_dir):
+    """
+    set up python virtual environment in env_dir using interpreter v
+    """
+    logger = LOGGERS['create_venv']
+    if run([v, '-m', 'venv', env_dir]) != 0:
+        sys.exit(1)
+    logger.info('instantiated {0} virtual environment at {1}'
+                ''.format(v, env_dir))
+    # the environment's own pip installs into it, no activation needed
+    pip = os.path.join(env_dir, 'bin', 'pip')
+    if run([pip, 'install', '-U', 'pip']) != 0:
+        sys.exit(1)
     logger.info('upgraded pip to latest version')
     for dependency in DEFAULT_DEPENDENCIES:
-        cmd = 'workon {} && pip install -U {} && deactivate'.format(
-            venv_name, dependency)
-        run(cmd)
+        if run([pip, 'install', '-U', dependency]) != 0:
+            sys.exit(1)
         logger.info('installed dependency "{}"'.format(dependency))
 
 
@@ -236,15 +368,15 @@ def create_git(where):
     """
     create git repository
     """
-    logger = logging.getLogger(sys._getframe().f_code.co_name)
-    cmd = 'git init {0}'.format(where)
-    run(cmd)
+    logger = LOGGERS['create_git']
+    if run(['git', 'init', where]) != 0:
+        sys.exit(1)
     logger.info('initialized git repository at {0}'.format(where))
     logger.debug('trying to set up .gitignore')
     fp = os.path.join(where, '.gitignore')
-    shutil.copy(GITIGNORE_FILE, fp)
-    git_it(where, '.gitignore', 'intial values for .gitignore')
-    logger.info('instantiated .gitignore and committed it')
+    _copy_template(GITIGNORE_FILE, fp)
+    BATCHER.add(where, '.gitignore', 'intial values for .gitignore')
+    logger.info('instantiated .gitignore and queued it for commit')
 
 
 @arglogger
@@ -252,20 +384,15 @@ def init_script(where, py_ver, git=False):
     """
     include a python script template
     """
-    logger = logging.getLogger(sys._getframe().f_code.co_name)
+    logger = LOGGERS['init_script']
     src = TEMPLATES['script-{0}'.format(py_ver)]
     logger.debug('src: {0}'.format(src))
-    src = os.path.expanduser(src)
-    logger.debug('src: {0}'.format(src))
-    src = os.path.abspath(src)
-    logger.debug('src: {0}'.format(src))
     dest_fn = '{0}.py'.format(os.path.basename(where))
     dest = os.path.join(where, dest_fn)
-    shutil.copy2(src, dest)
+    _copy_template(src, dest)
     logger.debug('copied {0} to {1}'.format(src, dest))
     if git:
-        git_it(os.path.dirname(dest), dest_fn,
-               'include default script template')
+        BATCHER.add(where, dest_fn, 'include default script template')
     logger.info('added script template as {0}'.format(dest_fn))
 
 
@@ -274,7 +401,8 @@ def init_package(where, args):
     """
     set up as a python package
     """
-    logger = logging.getLogger(sys._getframe().f_code.co_name)
+    from concurrent.futures import ThreadPoolExecutor
+    logger = LOGGERS['init_package']
 
     # create subordinate package folders
     for sub_dir in PACKAGE_SUBDIRECTORIES:
@@ -303,74 +431,139 @@ def init_package(where, args):
             ['tests']
         )
     ]
-    for template in templates:
+    # the templates are independent of one another, so render them in
+    # parallel; commits are queued afterwards, in template order
+    dest_dirs = [os.path.join(where, *template[1]) for template in templates]
+    with ThreadPoolExecutor(max_workers=TEMPLATE_WORKERS) as executor:
+        dest_fns = list(executor.map(
+            lambda template, dest_dir: fixup_template(
+                dest_dir, template[0], args),
+            templates, dest_dirs))
+    for template, dest_dir, dest_fn in zip(templates, dest_dirs, dest_fns):
         logger.debug('template: {0}'.format(template[0]))
-        src = os.path.expanduser(template[0])
-        src = os.path.abspath(src)
-        dest_fn = os.path.basename(src)
-        dest = os.path.join(where, *template[1], dest_fn)
-        shutil.copy2(src, dest)
-        logger.debug('copied {0} to {1}'.format(src, dest))
-        dest_fn = fixup_template(
-            os.path.join(where, *template[1]), template[0], args)
         if args.git:
-            git_it(os.path.dirname(dest), dest_fn,
-                   'include default {0} template'.format(dest_fn))
-            logger.info('instantiated {0} and committed it'.format(dest_fn))
+            BATCHER.add(where, os.path.join(*template[1], dest_fn),
+                        'include default {0} template'.format(dest_fn))
+            logger.info('instantiated {0} and queued it for commit'
+                        ''.format(dest_fn))
         else:
             logger.info('instantiated {0}'.format(dest_fn))
 
+
+@lru_cache(maxsize=None)
+def _parse_template(path):
+    """
+    read a template once and return its text, field names, and segments
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        t = f.read()
+    segments = tuple(_FORMATTER.parse(t))
+    fkeys = tuple(v[1] for v in segments if v[1] is not None)
+    return (t, fkeys, segments)
+
+
+def _render(segments, replacements):
+    """
+    render pre-parsed template segments in a single pass
+    """
+    parts = []
+    for literal, field, spec, conversion in segments:
+        parts.append(literal)
+        if field is not None:
+            val = replacements[field]
+            if conversion:
+                val = _FORMATTER.convert_field(val, conversion)
+            parts.append(format(val, spec) if spec else str(val))
+    return ''.join(parts)
+
+
 @arglogger
 def fixup_template(where, template, args):
     """
-    rename template and substitute variables if necessary
+    write template into where, renamed and with variables substituted
     """
-    logger = logging.getLogger(sys._getframe().f_code.co_name)
+    logger = LOGGERS['fixup_template']
+    assert os.path.isabs(where)
     fn = os.path.basename(template)
     logger.debug('running fixup_template on {0}'.format(fn))
-    with open(os.path.join(where, fn), 'r') as f:
-        t = f.read()
+    t, fkeys, segments = _parse_template(template)
+    new_fn = TEMPLATE_RENAMES.get(fn, fn)
+    dest = os.path.join(where, new_fn)
+    if len(fkeys) == 0 and '{{' not in t and '}}' not in t:
+        # nothing to substitute, so there is nothing to render or back up
+        shutil.copyfile(template, dest)
+        logger.debug('copied {0} to {1}'.format(template, dest))
+        return(new_fn)
     logger.debug('setting up replacements for {0}'.format(fn))
-    fkeys = [v[1] for v in Formatter().parse(t) if v[1] is not None]
-    if len(fkeys) > 0:
-        logger.debug('fkeys: {0}'.format(', '.join(fkeys)))
-        replacements = {}
-        missed = []
-        for fk in fkeys:
+    logger.debug('fkeys: {0}'.format(', '.join(fkeys)))
+    replacements = {}
+    missed = []
+    for fk in fkeys:
+        try:
+            val = vars(args)[fk]
+        except KeyError:
+            missed.append(fk)
+        else:
+            replacements[fk] = val
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug('replacements: {0}'.format(', '.join(
+            ['[{0}]: "{1}"'.format(k, v)
+             for k, v in replacements.items()])))
+    if 'pkgreadme' in missed:
+        replacements['pkgreadme'] = os.path.basename(TEMPLATES['readme'])
+    if 'project_name' in missed:
+        replacements['project_name'] = os.path.basename(where)
+    if 'classlicense' in missed:
+        replacements['classlicense'] = LICENSE_CLASSIFIERS.get(
+            args.license, DEFAULT_CLASSIFIER)
+    logger.debug("missed: {0}".format(', '.join(missed)))
+    logger.debug('read replacements from args')
+    logger.debug(replacements)
+    logger.debug('attemping replacements in {0}'.format(fn))
+    logger.debug(t)
+    logger.debug(replacements)
+    t = _render(segments, replacements)
+    logger.debug(t)
+    if logger.isEnabledFor(logging.DEBUG):
+        # the pre-substitution text is the template itself, so copy it
+        # kernel-side rather than re-encoding it; a hardlink would let edits
+        # to the .bak leak back into the shared template
+        shutil.copyfile(template, os.path.join(where, '{0}.bak'.format(fn)))
+    _write_text(dest, t)
+    logger.debug('wrote {0} to {1}'.format(template, dest))
+    return(new_fn)
+
+
+def _copy_template(src, dest):
+    """
+    copy a template file's contents, as a copy-on-write clone if possible
+    """
+    if sys.platform.startswith('linux'):
+        # FICLONE is a linux ioctl; elsewhere the number means something else
+        import fcntl
+        with open(src, 'rb') as s, open(dest, 'wb') as d:
             try:
-                val = vars(args)[fk]
-            except KeyError:
-                missed.append(fk)
-            else:
-                replacements[fk] = val
-        logger.debug('replacements: {0}'.format(', '.join(['[{0}]: "{1}"'.format(k, v)
-                     for k, v in replacements.items()])))
-        if 'pkgreadme' in missed:
-            replacements['pkgreadme'] = os.path.basename(TEMPLATES['readme'])
-        if 'project_name' in missed:
-            replacements['project_name'] = os.path.basename(where)
-        if 'classlicense' in missed:
-            replacements['classlicense'] = LICENSES[args.license]['classifier']
-        logger.debug("missed: {0}".format(', '.join(missed)))
-        logger.debug('read replacements from args')
-        logger.debug(replacements)
-        logger.debug('attemping replacements in {0}'.format(fn))
-        logger.debug(t)
-        logger.debug(replacements)
-        t = t.format(**replacements)
-        logger.debug(t)
-    shutil.copy2(os.path.join(where, fn),
-                 os.path.join(where, '{0}.bak'.format(fn)))
-    with open(os.path.join(where, fn), 'w') as f:
-        f.write(t)
+                fcntl.ioctl(d.fileno(), getattr(fcntl, 'FICLONE', _FICLONE),
+                            s.fileno())
+            except OSError:
+                # filesystem can't clone; copy through the open files instead
+                _copy_rest(s, d)
+        return
+    shutil.copyfile(src, dest)
+
+
+def _write_text(path, text):
+    """
+    write text to path in a single open/write/close
+    """
+    # surrogateescape writes undecodable command line bytes back unchanged
+    data = memoryview(text.encode('utf-8', 'surrogateescape'))
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
     try:
-        new_fn = TEMPLATE_RENAMES[fn]
-    except KeyError:
-        pass
-    else:
-        os.rename(os.path.join(where, fn), os.path.join(where, new_fn))
-        return(new_fn)
-    return(fn)
+        while data:
+            data = data[os.write(fd, data):]
+    finally:
+        os.close(fd)
 
 
 @arglogger
@@ -378,94 +571,330 @@ def make_subdir(where, git, dname, init, children):
     """
     create a subdirectory
     """
-    logger = logging.getLogger(sys._getframe().f_code.co_name)
-    target = os.path.join(where, dname)
-    logger.debug('trying to make "{0}"'.format(target))
-    try:
-        os.makedirs(target)
-    except OSError as e:
-        if e.errno == errno.EEXIST and os.path.isdir(where):
+    logger = LOGGERS['make_subdir']
+    stack = [(where, dname, init, children)]
+    while stack:
+        parent, dname, init, children = stack.pop()
+        target = os.path.join(parent, dname)
+        logger.debug('trying to make "{0}"'.format(target))
+        if os.path.isdir(target):
             logger.critical(
                 'script run with directory creation, but {0} already exists'
                 ''.format(target))
             sys.exit(1)
-    if init:
-        fn = '__init__.py'
-        fp = os.path.join(target, fn)
-        with open(fp, 'w'):
-            pass
-        if git:
-            git_it(target, fn, 'make {0} part of the package by adding '
-                   '__init__.py'.format(target))
-            logger.info('instantiated {0} and committed it'.format(fp))
-        else:
-            logger.info('instantiated {0}'.format(fp))
-    for child in children:
-        make_subdir(target, git, *child)
+        os.makedirs(target, exist_ok=True)
+        if init:
+            fn = '__init__.py'
+            fp = os.path.join(target, fn)
+            os.close(os.open(fp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644))
+            if git:
+                BATCHER.add(where, os.path.relpath(fp, where),
+                            'make {0} part of the package by adding '
+                            '__init__.py'.format(target))
+                logger.info('instantiated {0} and queued it for commit'
+                            ''.format(fp))
+            else:
+                logger.info('instantiated {0}'.format(fp))
+        # reversed, so children are still visited in their listed order
+        stack.extend((target, *child) for child in reversed(children))
 
 
-@arglogger
-def git_it(where, what, msg):
+class GitBatcher(object):
     """
-    add and commit something to the git repository
+    collect files to commit so they go into the repository in one commit
+
+    Files are queued per repository, so flushing one project never picks up
+    another's. Each queue is unguarded, though: add and flush must not run
+    concurrently for the same repository.
     """
-    cmd = 'git add {0} && git commit -m "{1}"'.format(what, msg)
-    run(cmd, where)
+
+    def __init__(self):
+        self.logger = logging.getLogger('git')
+        self.pending = {}
+
+    def add(self, where, what, msg):
+        """
+        queue what (a path relative to the repository at where) to be
+        committed, with msg as its note
+        """
+        self.pending.setdefault(where, deque()).append((what, msg))
+
+    def flush(self, where, msg):
+        """
+        add and commit everything queued for the repository at where
+        """
+        queued = self.pending.pop(where, ())
+        paths = [what for what, note in queued]
+        notes = [note for what, note in queued]
+        if len(paths) == 0:
+            return
+        if run(['git', 'add', '--'] + paths, where) != 0:
+            sys.exit(1)
+        if len(notes) == 1:
+            commit = ['git', 'commit', '-m', notes[0]]
+        else:
+            commit = ['git', 'commit', '-m', msg,
+                      '-m', '\n'.join(['- {0}'.format(n) for n in notes])]
+        if run(commit, where) != 0:
+            sys.exit(1)
+        self.logger.info('committed {0}'.format(', '.join(paths)))
+
+
+BATCHER = GitBatcher()
 
 
 @arglogger
 def run(cmd, where=None, check=True):
     """
-    use subprocess to execute a desired command in the shell
+    use subprocess to execute a desired command (an argv list) in where
+
+    Returns the command's exit status, or None if it could not be started
+    at all (e.g., the program does not exist).
     """
-    logger = logging.getLogger(sys._getframe().f_code.co_name)
-    run_params = [
-        'bash',
-        '-c',
-        '. ~/.bash_profile'
-    ]
-    if where is not None:
-        run_params[-1] += ' && cd {0}'.format(where)
-    run_params[-1] += ' && {0}'.format(cmd)
-    logger.debug('run_params: \n      {0}'.format('\n      '.join(run_params)))
+    import subprocess
+    logger = LOGGERS['run']
+    run_params = list(cmd)
+    debug = logger.isEnabledFor(logging.DEBUG)
+    if debug:
+        logger.debug('run_params: \n      {0}'.format(
+            '\n      '.join(run_params)))
+    # stream the combined output as it arrives, so long-running commands
+    # log live and a chatty child can never fill the pipe and stall
+    output = []
     try:
-        result = subprocess.run(
-            run_params,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            check=check).stdout
-    except subprocess.CalledProcessError as e:
+        with subprocess.Popen(
+                run_params,
+                cwd=where,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                errors='replace') as p:
+            for line in p.stdout:
+                output.append(line)
+                if debug:
+                    logger.debug('output: {0}'.format(line.rstrip('\n')))
+    except OSError as e:
+        if check:
+            logger.critical('subprocess execution failed to start:\n'
+                            '    command was: "{0}"\n    error: {1}'
+                            ''.format(run_params, e))
+        return None
+    if check and p.returncode != 0:
         logger.critical('subprocess execution failed with status code '
-                        '{0}:\n    '.format(e.returncode) +
-                        'command was: "{0}\n      "'.format(run_params))
+                        '{0}:\n    command was: "{1}"\n    output: {2}'
+                        ''.format(p.returncode, run_params,
+                                  ''.join(output).strip()))
+    return p.returncode
 
 
-def fetch(targets, strip_yaml=False):
+@lru_cache(maxsize=None)
+def _session():
     """
-    fetch file(s) from url(s), concatenate, and save locally
+    return the shared requests session, importing requests on first use
     """
-    logger = logging.getLogger(sys._getframe().f_code.co_name)
-    for target in targets:
-        logger.debug('requesting {0}'.format(target[0]))
-        r = requests.get(target[0], stream=True)
-        if r.status_code == 200:
-            # appending ensures we can aggregate, e.g., .gitignore content
-            with open('{0}'.format(target[1]), 'ab') as f:
-                r.raw.decode_content = True
-                shutil.copyfileobj(r.raw, f)
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    retry = Retry(total=3, backoff_factor=0.3,
+                  status_forcelist=(500, 502, 503, 504),
+                  raise_on_status=False)
+    session = requests.Session()
+    session.mount('https://', HTTPAdapter(pool_connections=FETCH_WORKERS,
+                                          pool_maxsize=FETCH_WORKERS,
+                                          max_retries=retry))
+    return session
+
+
+@arglogger
+def _cached_get(url, cache=True):
+    """
+    return the path to a local copy of url, revalidated against its etag
+    and last-modified date once it is older than CACHE_TTL
+
+    With cache False, always download url (refreshing the local copy).
+    """
+    import hashlib
+    import requests
+    import tempfile
+    logger = LOGGERS['_cached_get']
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    cache_path = os.path.join(
+        CACHE_DIR, hashlib.sha256(url.encode('utf-8')).hexdigest())
+    meta_path = '{0}.meta'.format(cache_path)
+    missing_path = '{0}.404'.format(cache_path)
+    cached = False
+    if cache:
+        try:
+            age = time.time() - os.stat(missing_path).st_mtime
+        except FileNotFoundError:
+            pass
         else:
-            raise Exception('fetch of {0} failed with status code {1}'
-                            ''.format([0], r.status_code))
-            sys.exit(1)
+            if age < CACHE_404_TTL:
+                raise RuntimeError('fetch of {0} failed with status code 404 '
+                                   '(cached {1:.0f}s ago)'.format(url, age))
+        try:
+            age = time.time() - os.stat(cache_path).st_mtime
+        except FileNotFoundError:
+            pass
+        else:
+            cached = True
+            if age < CACHE_TTL:
+                logger.debug('{0} cached {1:.0f}s ago; using cached copy'
+                             ''.format(url, age))
+                return cache_path
+    # these are small text files: skip gzip so bodies come back as-is and
+    # Content-Length is the real size
+    headers = {'Accept-Encoding': 'identity'}
+    if cached:
+        try:
+            with open(meta_path, 'r') as f:
+                meta = json.load(f)
+        except (FileNotFoundError, ValueError):
+            meta = {}
+        if meta.get('etag') is not None:
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified') is not None:
+            headers['If-Modified-Since'] = meta['last_modified']
+    try:
+        r = _session().get(url, headers=headers, stream=True,
+                           timeout=FETCH_TIMEOUT)
+    except requests.exceptions.RequestException as e:
+        if not cached:
+            raise
+        logger.warning('request for {0} failed ({1}); using cached copy'
+                       ''.format(url, e))
+        return cache_path
+    # release the pooled connection on every path, not just after a read
+    with r:
+        if r.status_code == 304:
+            logger.debug('{0} not modified; using cached copy'.format(url))
+            os.utime(cache_path)  # fresh again for another CACHE_TTL
+            return cache_path
+        if r.status_code == 404:
+            # remember the miss so repeated runs don't keep asking for it
+            with open(missing_path, 'w'):
+                pass
+        if r.status_code != 200:
+            raise RuntimeError('fetch of {0} failed with status code {1}'
+                               ''.format(url, r.status_code))
+        # write to a temporary file and swap it in, so an interrupted download
+        # never leaves a truncated cache entry behind
+        fd, tmp = tempfile.mkstemp(dir=CACHE_DIR)
+        with os.fdopen(fd, 'wb') as f:
+            length = r.headers.get('Content-Length')
+            if length is not None and int(length) < FETCH_BUFFERED_MAX:
+                f.write(r.content)
+            else:
+                for chunk in r.iter_content(FETCH_CHUNK_SIZE):
+                    f.write(chunk)
+        os.replace(tmp, cache_path)
+    fd, tmp = tempfile.mkstemp(dir=CACHE_DIR)
+    with os.fdopen(fd, 'w') as f:
+        json.dump({
+            'url': url,
+            'etag': r.headers.get('ETag'),
+            'last_modified': r.headers.get('Last-Modified')
+        }, f)
+    os.replace(tmp, meta_path)
+    if os.path.isfile(missing_path):
+        os.remove(missing_path)
+    logger.debug('cached {0} as {1}'.format(url, cache_path))
+    return cache_path
+
+
+@arglogger
+def fetch(targets, strip_yaml=False, cache=True):
+    """
+    fetch file(s) from url(s), concatenate, and save locally, optionally
+    dropping each file's yaml front matter on the way
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    logger = LOGGERS['fetch']
+    assert all(os.path.isabs(target[1]) for target in targets)
+    urls = [target[0] for target in targets]
+    logger.debug('requesting {0}'.format(', '.join(urls)))
+    _session()  # set up the shared session before the workers need it
+    # download concurrently, but write serially in target order so that
+    # aggregated destinations (e.g., .gitignore content) come out the same
+    # regardless of which request finishes first
+    with ThreadPoolExecutor(
+            max_workers=max(1, min(FETCH_WORKERS, len(urls)))) as executor:
+        sources = list(executor.map(_cached_get, urls,
+                                    [cache] * len(urls)))
+    written = set()
+    for target, src in zip(targets, sources):
+        # the first write to a destination replaces it, so re-runs don't
+        # duplicate content; later targets for the same destination append,
+        # which lets us aggregate, e.g., .gitignore content
+        mode = 'ab' if target[1] in written else 'wb'
+        written.add(target[1])
+        with open(src, 'rb') as s, open(target[1], mode) as f:
+            if strip_yaml:
+                f.write(_skip_front_matter(s))
+            _copy_rest(s, f)
         logger.debug('successfully saved {0} as {1}'.format(*target))
-    if strip_yaml:
-        for target in targets:
-            fp = target[1]
-            post = frontmatter.load(fp)
-            shutil.copy(fp, os.path.splitext(fp)[0] + '.bak')
-            with open(fp, 'w') as f:
-                f.write(post.content)
-            logger.debug('removed yaml front matter from {0}'.format(fp))
+
+
+def _copy_rest(src, dest):
+    """
+    copy the remainder of binary file src onto the end of binary file dest,
+    kernel-side with sendfile where the platform allows it
+    """
+    offset = src.tell()
+    dest.flush()
+    try:
+        size = os.fstat(src.fileno()).st_size
+        while offset < size:
+            sent = os.sendfile(dest.fileno(), src.fileno(), offset,
+                               size - offset)
+            if sent == 0:
+                break
+            offset += sent
+    except (AttributeError, OSError):
+        # no sendfile, or not between these two files (e.g., an O_APPEND
+        # destination on older kernels): finish the copy in user space
+        src.seek(offset)
+        shutil.copyfileobj(src, dest, FETCH_CHUNK_SIZE)
+
+
+def _skip_front_matter(f):
+    """
+    read past a leading yaml front matter block in binary file f
+
+    Returns whatever was read beyond the block (or everything read, if f has
+    no front matter) for the caller to write before copying the rest of f.
+    """
+    head = f.read(FETCH_CHUNK_SIZE)
+    if not head.startswith((b'---\n', b'---\r\n')):
+        return head
+    while True:
+        m = _FRONT_MATTER_END.search(head, 3)
+        if m is not None:
+            return head[m.end():].lstrip(b'\r\n')
+        if len(head) >= FRONT_MATTER_MAX:
+            return head  # too long to be front matter; leave it be
+        more = f.read(FETCH_CHUNK_SIZE)
+        if not more:
+            return head  # no closing fence, so not front matter after all
+        head += more
+
+
+@lru_cache(maxsize=1)
+def _build_parser():
+    """
+    build the command line parser from ARGUMENT_SPECS (once per process)
+    """
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    for short, long, d in ARGUMENT_SPECS:
+        parser.add_argument(short, long, **d)
+    parser.add_argument(
+        'where',
+        type=str,
+        nargs='?',
+        help='path to desired project directory')
+    return parser
 
 
 if __name__ == "__main__":
@@ -474,36 +903,15 @@ if __name__ == "__main__":
     logging.basicConfig(level=log_level)
 
     try:
-        parser = argparse.ArgumentParser(
-            description=__doc__,
-            formatter_class=argparse.ArgumentDefaultsHelpFormatter)
-        for p in POSITIONAL_ARGUMENTS:
-            d = {
-                'help': p[3]
-            }
-            if type(p[2]) == bool:
-                if p[2] is False:
-                    d['action'] = 'store_true'
-                    d['default'] = False
-                else:
-                    d['action'] = 'store_false'
-                    d['default'] = True
-            else:
-                d['default'] = p[2]
-            parser.add_argument(
-                p[0],
-                p[1],
-                **d)
-        parser.add_argument(
-            'where',
-            type=str,
-            help='path to desired project directory')
+        parser = _build_parser()
         args = parser.parse_args()
+        if (args.batch is None) == (args.where is None):
+            parser.error('give either a project directory or --batch')
         if args.loglevel is not None:
-            args_log_level = re.sub('\s+', '', args.loglevel.strip().upper())
-            try:
-                log_level = getattr(logging, args_log_level)
-            except AttributeError:
+            args_log_level = args.loglevel.translate(_WS_TABLE).upper()
+            if args_log_level in LOG_LEVELS:
+                log_level = LOG_LEVELS[args_log_level]
+            else:
                 logging.error(
                     "command line option to set log_level failed "
                     "because '%s' is not a valid level name; using %s"
@@ -516,7 +924,9 @@ if __name__ == "__main__":
             log_level = logging.CRITICAL
         log_level_name = logging.getLevelName(log_level)
         logging.getLogger().setLevel(log_level)
-        fn_this = inspect.stack()[0][1].strip()
+        if log_level > logging.DEBUG:
+            unwrap_argloggers(globals())
+        fn_this = __file__
         title_this = __doc__.strip()
         logging.info(': '.join((fn_this, title_this)))
         if log_level != DEFAULT_LOG_LEVEL:
@@ -527,7 +937,10 @@ if __name__ == "__main__":
             logging.info("using default logging level: %s" % log_level_name)
         logging.debug("command line: '%s'" % ' '.join(sys.argv))
         try:
-            main(args)
+            if args.batch is not None:
+                batch(args)
+            else:
+                main(args)
         except ValueError as e:
             logging.critical(e)
             sys.exit(1)
@@ -19,7 +19,7 @@ setup(
         'Development Status :: {classdevstatus}',
         'Intended Audience :: {classaudience}',
         'Topic :: {classtopic}',
-        'License :: {classlicense}'
+        '{classlicense}'
     ],
     keywords='{pkgkeywords}',
 